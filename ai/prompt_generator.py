@@ -9,6 +9,8 @@ import openai
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Any
 
+from config.config_loader import YAML_LOADER
+
 class TestPromptGenerator:
     """Generates test cases from natural language prompts or API docs using OpenAI."""
     
@@ -172,7 +174,7 @@ class TestPromptGenerator:
             if spec_path.endswith('.json'):
                 return json.load(f)
             elif spec_path.endswith(('.yaml', '.yml')):
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=YAML_LOADER)
             else:
                 raise ValueError("Unsupported specification file format. Use JSON or YAML.")
     
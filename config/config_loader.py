@@ -3,10 +3,24 @@ Configuration loader for SmartTestAI framework.
 Handles loading and validating YAML configuration files.
 """
 import os
+import copy
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# Safe YAML loader for the repo-level scripts (API tests, AI helpers). It is
+# not imported from smarttestai, whose package import pulls in Selenium.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=None)
+def _parse_config_file(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML config file once per (path, modification time)."""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
 class ConfigLoader:
     """Loads and validates test configuration from YAML files."""
     
@@ -34,8 +48,10 @@ class ConfigLoader:
         if not os.path.exists(self.config_path):
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
         
-        with open(self.config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Parsed files are shared process-wide; hand each loader its own copy
+        config_path = os.path.realpath(self.config_path)
+        parsed = _parse_config_file(config_path, os.stat(config_path).st_mtime_ns)
+        self.config = copy.deepcopy(parsed)
             
         return self.config
     
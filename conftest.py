@@ -0,0 +1,33 @@
+"""
+Shared pytest configuration for SmartTestAI test modules.
+"""
+import os
+import sys
+from pathlib import Path
+
+# Make project packages (config, utils, ...) importable from any test module
+_PROJECT_ROOT = str(Path(__file__).parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+
+def pytest_addoption(parser):
+    """Register SmartTestAI command line options."""
+    parser.addoption(
+        "--no-schema",
+        action="store_true",
+        default=False,
+        help="Skip JSON schema validation in API tests (smoke runs)"
+    )
+    parser.addoption(
+        "--http1",
+        action="store_true",
+        default=False,
+        help="Use HTTP/1.1 instead of HTTP/2 for API test clients"
+    )
+
+
+def pytest_configure(config):
+    """Expose --no-schema to test modules before they are collected."""
+    if config.getoption("no_schema"):
+        os.environ["SMARTTESTAI_SKIP_SCHEMA"] = "1"
@@ -32,7 +32,7 @@ from typing import List, Optional
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from smarttestai.core.ai_config import AIConfig
+from smarttestai.core.ai_config import AIConfig, YAML_LOADER
 from smarttestai.runners.base_runner import BaseRunner
 
 
@@ -65,7 +65,7 @@ def discover_suites():
                 try:
                     # Validate config can be loaded
                     with open(config_file, 'r') as f:
-                        config = yaml.safe_load(f)
+                        config = yaml.load(f, Loader=YAML_LOADER)
                     if config and 'suite_info' in config:
                         suites.append({
                             'name': suite_dir.name,
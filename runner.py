@@ -340,6 +340,9 @@ class TestRunner:
                 self.logger.info("Sent email notification")
             except Exception as e:
                 self.logger.error(f"Error sending email notification: {e}")
+            finally:
+                # Send QUIT rather than leaving the SMTP session open
+                self.notification_sender.close()
     
     def generate_test(self, prompt: str, endpoint: str, method: str, 
                      output_dir: str = None, filename: str = None) -> str:
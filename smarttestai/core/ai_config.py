@@ -11,6 +11,10 @@ from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Safe YAML loader for the framework; prefers libyaml's C loader when PyYAML
+# was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConfigurationError(Exception):
     """Exception raised for configuration-related errors"""
@@ -95,7 +99,7 @@ class AIConfig:
             
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f) or {}
+                config = yaml.load(f, Loader=YAML_LOADER) or {}
             
             # Validate required configuration sections
             cls._validate_config(config, suite_name)
@@ -11,7 +11,6 @@ import logging
 import time
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -53,10 +52,19 @@ class BaseRunner:
         self.report_formats = ["html"]
         self.open_report = False
         
-        # Create results directory
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.results_dir = self.project_root / "results" / f"run_{self.timestamp}"
-        self.results_dir.mkdir(parents=True, exist_ok=True)
+        # Create results directory. The pid keeps concurrent runs apart; the
+        # directory is created exclusively so a clash is retried, not merged.
+        base_timestamp = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.timestamp = base_timestamp
+        attempt = 0
+        while True:
+            self.results_dir = self.project_root / "results" / f"run_{self.timestamp}"
+            try:
+                self.results_dir.mkdir(parents=True, exist_ok=False)
+                break
+            except FileExistsError:
+                attempt += 1
+                self.timestamp = f"{base_timestamp}_{attempt}"
         
         logger.info(f"Initialized runner for suite: {suite_name}")
         logger.info(f"Results will be saved to: {self.results_dir}")
@@ -205,23 +213,33 @@ class BaseRunner:
                 workers = self.config.get("test_execution", {}).get("max_workers", 4)
                 cmd.extend(["-n", str(workers)])
             
-            # Add reporting options
-            allure_dir = self.results_dir / "allure_results"
-            allure_dir.mkdir(exist_ok=True)
-            cmd.extend(["--alluredir", str(allure_dir)])
-            
-            # Add JUnit XML output
-            junit_file = self.results_dir / "junit.xml"
-            cmd.extend(["--junitxml", str(junit_file)])
-            
-            # Add verbose output
-            cmd.append("-v")
+            # Add Allure output only when an Allure report was requested
+            allure_dir = None
+            if "allure" in self.report_formats:
+                allure_dir = self.results_dir / "allure_results"
+                allure_dir.mkdir(exist_ok=True)
+                cmd.extend(["--alluredir", str(allure_dir)])
+            
+            # Add JUnit XML output only for AI analysis, its sole consumer
+            junit_file = None
+            if self.config.get("ai_features", {}).get("test_analysis", False):
+                junit_file = self.results_dir / "junit.xml"
+                cmd.extend(["--junitxml", str(junit_file)])
+            
+            # The HTML report embeds stdout as its test-level detail, so keep
+            # per-test PASSED/FAILED lines whenever it is requested
+            if "html" in self.report_formats:
+                cmd.append("-v")
+            else:
+                cmd.extend(["-q", "--tb=short"])
             
             # Set environment variables
-            env = os.environ.copy()
-            env["SMARTTESTAI_SUITE"] = self.suite_name
-            env["SMARTTESTAI_CONFIG"] = str(self.suite_path / "config.yaml")
-            env["SMARTTESTAI_RESULTS_DIR"] = str(self.results_dir)
+            env = {
+                **os.environ,
+                "SMARTTESTAI_SUITE": self.suite_name,
+                "SMARTTESTAI_CONFIG": str(self.suite_path / "config.yaml"),
+                "SMARTTESTAI_RESULTS_DIR": str(self.results_dir),
+            }
             
             # Execute pytest
             logger.info(f"Executing command: {' '.join(cmd)}")
@@ -244,8 +262,8 @@ class BaseRunner:
                 "execution_time": execution_time,
                 "stdout": result.stdout,
                 "stderr": result.stderr,
-                "junit_file": str(junit_file),
-                "allure_dir": str(allure_dir)
+                "junit_file": str(junit_file) if junit_file else None,
+                "allure_dir": str(allure_dir) if allure_dir else None
             }
             
         except subprocess.TimeoutExpired:
@@ -285,7 +303,7 @@ class BaseRunner:
             analysis_file = self.results_dir / "ai_analysis.json"
             import json
             with open(analysis_file, 'w') as f:
-                json.dump(insights, f, indent=2)
+                f.write(json.dumps(insights, indent=2))
             
             return {
                 "success": True,
@@ -306,55 +324,78 @@ class BaseRunner:
             generated_reports = []
             main_report_path = None
             
-            # Generate HTML report
-            if "html" in self.report_formats:
-                from smarttestai.utils.report_generator import HTMLReportGenerator
-                
-                html_generator = HTMLReportGenerator(self.config)
-                html_report = reports_dir / "test_report.html"
-                
-                html_generator.generate(
-                    execution_result,
-                    analysis_result.get("insights", {}),
-                    str(html_report)
-                )
-                
-                generated_reports.append(str(html_report))
-                if not main_report_path:
-                    main_report_path = str(html_report)
-            
-            # Generate Allure report
+            # Kick off Allure first so the CLI runs while HTML/JSON are written
+            allure_proc = None
+            allure_report_dir = reports_dir / "allure_report"
             if "allure" in self.report_formats:
-                allure_report_dir = reports_dir / "allure_report"
                 allure_results_dir = execution_result.get("allure_dir")
                 
                 if allure_results_dir and Path(allure_results_dir).exists():
                     cmd = ["allure", "generate", allure_results_dir, "-o", str(allure_report_dir), "--clean"]
                     try:
-                        subprocess.run(cmd, check=True, capture_output=True)
-                        generated_reports.append(str(allure_report_dir))
-                        logger.info("Allure report generated successfully")
-                    except subprocess.CalledProcessError as e:
-                        logger.warning(f"Allure report generation failed: {e}")
+                        allure_proc = subprocess.Popen(
+                            cmd,
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE,
+                            text=True
+                        )
                     except FileNotFoundError:
                         logger.warning("Allure command not found. Install Allure to generate reports.")
             
-            # Generate JSON report
-            if "json" in self.report_formats:
-                json_report = reports_dir / "test_results.json"
-                report_data = {
-                    "suite": self.suite_name,
-                    "timestamp": self.timestamp,
-                    "execution": execution_result,
-                    "analysis": analysis_result,
-                    "config": self.config
-                }
+            # Don't leave the Allure child running if a Python-side report fails
+            try:
+                # Generate HTML report
+                if "html" in self.report_formats:
+                    from smarttestai.utils.report_generator import HTMLReportGenerator
+                    
+                    html_generator = HTMLReportGenerator(self.config)
+                    html_report = reports_dir / "test_report.html"
+                    
+                    html_generator.generate(
+                        execution_result,
+                        analysis_result.get("insights", {}),
+                        str(html_report)
+                    )
+                    
+                    generated_reports.append(str(html_report))
+                    if not main_report_path:
+                        main_report_path = str(html_report)
                 
-                import json
-                with open(json_report, 'w') as f:
-                    json.dump(report_data, f, indent=2, default=str)
-                
-                generated_reports.append(str(json_report))
+                # Generate JSON report
+                if "json" in self.report_formats:
+                    json_report = reports_dir / "test_results.json"
+                    report_data = {
+                        "suite": self.suite_name,
+                        "timestamp": self.timestamp,
+                        "execution": execution_result,
+                        "analysis": analysis_result,
+                        "config": self.config
+                    }
+                    
+                    import json
+                    with open(json_report, 'w') as f:
+                        f.write(json.dumps(report_data, indent=2, default=str))
+                    
+                    generated_reports.append(str(json_report))
+            except BaseException:
+                if allure_proc is not None:
+                    allure_proc.kill()
+                    allure_proc.communicate()
+                raise
+            
+            # Wait for Allure only after the Python-side reports are done
+            if allure_proc is not None:
+                try:
+                    _, stderr = allure_proc.communicate(timeout=300)
+                    if allure_proc.returncode == 0:
+                        generated_reports.append(str(allure_report_dir))
+                        logger.info("Allure report generated successfully")
+                    else:
+                        logger.warning(f"Allure report generation failed (exit code {allure_proc.returncode}): {stderr}")
+                except subprocess.TimeoutExpired:
+                    allure_proc.kill()
+                    allure_proc.communicate()
+                    logger.warning("Allure report generation timed out")
             
             return {
                 "success": True,
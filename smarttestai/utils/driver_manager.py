@@ -3,7 +3,8 @@ Driver manager for handling browser setup and configuration.
 """
 
 import logging
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
@@ -11,6 +12,24 @@ from selenium.webdriver.firefox.options import Options as FirefoxOptions
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _chrome_args_for(config_key: Tuple[bool, str, Tuple[str, ...]]) -> Tuple[str, ...]:
+    """Build the Chrome argument list for a (headless, window_size, options) key"""
+    headless, window_size, extra_options = config_key
+    args = []
+    
+    # Set headless mode
+    if headless:
+        args.append("--headless")
+    
+    # Set window size
+    args.append(f"--window-size={window_size}")
+    
+    # Add additional options
+    args.extend(extra_options)
+    return tuple(args)
+
+
 class DriverManager:
     """
     Manages WebDriver instances with configuration-driven setup.
@@ -47,17 +66,14 @@ class DriverManager:
         """Create Chrome WebDriver with options"""
         options = ChromeOptions()
         
-        # Set headless mode
-        if browser_config.get("headless", False):
-            options.add_argument("--headless")
-        
-        # Set window size
-        window_size = browser_config.get("window_size", "1920,1080")
-        options.add_argument(f"--window-size={window_size}")
-        
-        # Add additional options
-        for option in browser_config.get("options", []):
-            options.add_argument(option)
+        # Arguments are cached per distinct browser config
+        config_key = (
+            bool(browser_config.get("headless", False)),
+            browser_config.get("window_size", "1920,1080"),
+            tuple(browser_config.get("options", [])),
+        )
+        for arg in _chrome_args_for(config_key):
+            options.add_argument(arg)
         
         logger.info("Creating Chrome WebDriver")
         return webdriver.Chrome(options=options)
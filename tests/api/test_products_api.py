@@ -2,24 +2,23 @@
 Example test module for the products endpoint.
 """
 import os
+import uuid
 import pytest
-import requests
+import httpx
+from hypothesis import given, settings, HealthCheck
+from hypothesis_jsonschema import from_schema
 from typing import Dict, Any
 
-# Import common test utilities
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+# Import common test utilities (project root is put on sys.path by conftest.py)
 from config.config_loader import ConfigLoader
 from utils.schema_validator import SchemaValidator
 
-# Load configuration
-config = ConfigLoader().load_config()
-BASE_URL = config.get("api", {}).get("base_url", "https://api.example.com/v1")
-AUTH_HEADERS = ConfigLoader().get_auth_header()
-
 # Initialize schema validator
 validator = SchemaValidator()
 
+# Smoke runs can skip schema validation (SMARTTESTAI_SKIP_SCHEMA=1 or --no-schema)
+SKIP_SCHEMA = os.environ.get("SMARTTESTAI_SKIP_SCHEMA") == "1"
+
 # Define product schemas
 PRODUCT_SCHEMA = {
     "type": "object",
@@ -50,18 +49,75 @@ PRODUCT_LIST_SCHEMA = {
     }
 }
 
+# Request body for creating a product: server-assigned fields are left out
+PRODUCT_CREATE_SCHEMA = {
+    "type": "object",
+    "required": ["name", "price"],
+    "properties": {
+        key: value for key, value in PRODUCT_SCHEMA["properties"].items()
+        if key not in ("id", "created_at", "updated_at")
+    },
+    "additionalProperties": False
+}
+PRODUCT_CREATE_SCHEMA["properties"]["name"] = {"type": "string", "minLength": 1}
+
+# Building a strategy from a schema is expensive, so do it once at import
+_product_strategy = from_schema(PRODUCT_CREATE_SCHEMA)
+
+@pytest.fixture(scope="session")
+def config_loader():
+    """Config loader, created only when a product test actually runs."""
+    return ConfigLoader()
+
+
+@pytest.fixture(scope="session")
+def api_config(config_loader) -> Dict[str, Any]:
+    """Loaded test configuration."""
+    return config_loader.load_config()
+
+
+@pytest.fixture(scope="session")
+def auth_headers(config_loader) -> Dict[str, str]:
+    """Authentication headers from the test configuration."""
+    return config_loader.get_auth_header()
+
+
+@pytest.fixture(scope="session")
+def http(api_config, auth_headers, pytestconfig):
+    """
+    Shared HTTP client so product tests reuse keep-alive connections.
+    
+    Requests are multiplexed over HTTP/2 unless --http1 is given for
+    servers that don't speak h2.
+    """
+    http2 = not pytestconfig.getoption("http1")
+    transport = httpx.HTTPTransport(
+        http2=http2,
+        retries=2,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=20)
+    )
+    client = httpx.Client(
+        headers=auth_headers,
+        transport=transport,
+        timeout=api_config.get("api", {}).get("timeout", 30),
+        follow_redirects=True
+    )
+    yield client
+    client.close()
+
 
 @pytest.fixture
-def products_url():
+def products_url(api_config):
     """Return the products endpoint URL."""
-    return f"{BASE_URL}/products"
+    base_url = api_config.get("api", {}).get("base_url", "https://api.example.com/v1")
+    return f"{base_url}/products"
 
 
 @pytest.fixture
 def product_data() -> Dict[str, Any]:
-    """Test product data fixture."""
+    """Test product data fixture (unique name so parallel workers don't collide)."""
     return {
-        "name": "Test Product",
+        "name": f"Test Product {uuid.uuid4()}",
         "description": "This is a test product",
         "price": 29.99,
         "category": "test",
@@ -69,7 +125,37 @@ def product_data() -> Dict[str, Any]:
     }
 
 
-def test_get_products_list(products_url):
+@pytest.fixture
+def cleanup(http, products_url, request):
+    """
+    Collect IDs of products created by a test and delete them on teardown.
+    
+    Cleanup runs even if the test fails midway. Should the API gain a bulk
+    delete endpoint, the finalizer can issue a single request for all IDs.
+    """
+    product_ids = []
+    
+    def _delete_products():
+        for product_id in product_ids:
+            http.delete(f"{products_url}/{product_id}")
+    
+    request.addfinalizer(_delete_products)
+    return product_ids
+
+
+@pytest.fixture
+def created_product(http, products_url, product_data, cleanup):
+    """Create a product for tests that operate on an existing one."""
+    response = http.post(products_url, json=product_data)
+    assert response.status_code == 201, f"Failed to create test product: {response.status_code}"
+    
+    product = response.json()
+    # Deleting an already-deleted product on teardown is a harmless no-op
+    cleanup.append(product["id"])
+    return product
+
+
+def test_get_products_list(http, products_url):
     """
     Test retrieving a list of products.
     
@@ -83,7 +169,7 @@ def test_get_products_list(products_url):
     params = {"page": 1, "page_size": 10}
     
     # Send request
-    response = requests.get(products_url, params=params, headers=AUTH_HEADERS)
+    response = http.get(products_url, params=params)
     
     # Assertions
     assert response.status_code == 200, f"Expected 200 OK but got {response.status_code}"
@@ -92,8 +178,9 @@ def test_get_products_list(products_url):
     data = response.json()
     
     # Schema validation
-    validation_result = validator.validate_response_safe(data, PRODUCT_LIST_SCHEMA)
-    assert validation_result["valid"], f"Schema validation failed: {validation_result['errors']}"
+    if not SKIP_SCHEMA:
+        validation_result = validator.validate_response_safe(data, PRODUCT_LIST_SCHEMA)
+        assert validation_result["valid"], f"Schema validation failed: {validation_result['errors']}"
     
     # Additional assertions
     assert "products" in data, "Response missing products array"
@@ -103,7 +190,7 @@ def test_get_products_list(products_url):
         assert data["page_size"] == params["page_size"], "Page size parameter not respected"
 
 
-def test_get_product_by_id(products_url):
+def test_get_product_by_id(http, products_url):
     """
     Test retrieving a single product by ID.
     
@@ -117,7 +204,7 @@ def test_get_product_by_id(products_url):
     product_url = f"{products_url}/{product_id}"
     
     # Send request
-    response = requests.get(product_url, headers=AUTH_HEADERS)
+    response = http.get(product_url)
     
     # Assertions
     assert response.status_code == 200, f"Expected 200 OK but got {response.status_code}"
@@ -126,14 +213,15 @@ def test_get_product_by_id(products_url):
     data = response.json()
     
     # Schema validation
-    validation_result = validator.validate_response_safe(data, PRODUCT_SCHEMA)
-    assert validation_result["valid"], f"Schema validation failed: {validation_result['errors']}"
+    if not SKIP_SCHEMA:
+        validation_result = validator.validate_response_safe(data, PRODUCT_SCHEMA)
+        assert validation_result["valid"], f"Schema validation failed: {validation_result['errors']}"
     
     # Additional assertions
     assert data["id"] == product_id, f"Product ID mismatch, expected {product_id}"
 
 
-def test_get_product_not_found(products_url):
+def test_get_product_not_found(http, products_url):
     """
     Test retrieving a non-existent product.
     
@@ -146,7 +234,7 @@ def test_get_product_not_found(products_url):
     product_url = f"{products_url}/{product_id}"
     
     # Send request
-    response = requests.get(product_url, headers=AUTH_HEADERS)
+    response = http.get(product_url)
     
     # Assertions
     assert response.status_code == 404, f"Expected 404 Not Found but got {response.status_code}"
@@ -159,7 +247,7 @@ def test_get_product_not_found(products_url):
     assert "not found" in data["error"].lower(), "Unexpected error message"
 
 
-def test_create_product(products_url, product_data):
+def test_create_product(http, products_url, product_data, cleanup):
     """
     Test creating a new product.
     
@@ -169,43 +257,64 @@ def test_create_product(products_url, product_data):
     - The response schema matches the expected structure
     """
     # Send request
-    response = requests.post(products_url, json=product_data, headers=AUTH_HEADERS)
+    response = http.post(products_url, json=product_data)
     
     # Assertions
     assert response.status_code == 201, f"Expected 201 Created but got {response.status_code}"
     
     # Parse response
     data = response.json()
+    assert "id" in data, "Response missing ID for created product"
+    cleanup.append(data["id"])
     
     # Schema validation
-    validation_result = validator.validate_response_safe(data, PRODUCT_SCHEMA)
-    assert validation_result["valid"], f"Schema validation failed: {validation_result['errors']}"
+    if not SKIP_SCHEMA:
+        validation_result = validator.validate_response_safe(data, PRODUCT_SCHEMA)
+        assert validation_result["valid"], f"Schema validation failed: {validation_result['errors']}"
     
     # Additional assertions
-    assert "id" in data, "Response missing ID for created product"
     assert data["name"] == product_data["name"], "Product name mismatch"
     assert data["price"] == product_data["price"], "Product price mismatch"
+
+
+@settings(max_examples=10, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(product=_product_strategy)
+def test_create_product_fuzz(http, products_url, cleanup, product):
+    """
+    Test creating products from schema-generated payloads.
+    
+    This test verifies that:
+    - Any payload matching the create schema returns 201 Created
+    - The response schema matches the expected structure
+    """
+    # Send request
+    response = http.post(products_url, json=product)
     
-    # Clean up - delete the created product
-    delete_url = f"{products_url}/{data['id']}"
-    requests.delete(delete_url, headers=AUTH_HEADERS)
+    # Assertions
+    assert response.status_code == 201, f"Expected 201 Created but got {response.status_code} for {product}"
+    
+    # Parse response; all generated products are deleted together on teardown
+    data = response.json()
+    cleanup.append(data["id"])
+    
+    # Schema validation
+    if not SKIP_SCHEMA:
+        validation_result = validator.validate_response_safe(data, PRODUCT_SCHEMA)
+        assert validation_result["valid"], f"Schema validation failed: {validation_result['errors']}"
+    
+    # Additional assertions
+    assert data["name"] == product["name"], "Product name mismatch"
 
 
-def test_update_product(products_url, product_data):
+def test_update_product(http, products_url, product_data, created_product):
     """
     Test updating an existing product.
     
     This test verifies that:
-    - First creates a product to update
     - The PUT endpoint returns 200 OK
     - The response contains the updated product
     - The product details are correctly updated
     """
-    # First create a product
-    create_response = requests.post(products_url, json=product_data, headers=AUTH_HEADERS)
-    assert create_response.status_code == 201, "Failed to create test product for update test"
-    
-    created_product = create_response.json()
     product_id = created_product["id"]
     
     # Update data
@@ -215,7 +324,7 @@ def test_update_product(products_url, product_data):
     
     # Send update request
     update_url = f"{products_url}/{product_id}"
-    update_response = requests.put(update_url, json=update_data, headers=AUTH_HEADERS)
+    update_response = http.put(update_url, json=update_data)
     
     # Assertions
     assert update_response.status_code == 200, f"Expected 200 OK but got {update_response.status_code}"
@@ -224,41 +333,33 @@ def test_update_product(products_url, product_data):
     updated_product = update_response.json()
     
     # Schema validation
-    validation_result = validator.validate_response_safe(updated_product, PRODUCT_SCHEMA)
-    assert validation_result["valid"], f"Schema validation failed: {validation_result['errors']}"
+    if not SKIP_SCHEMA:
+        validation_result = validator.validate_response_safe(updated_product, PRODUCT_SCHEMA)
+        assert validation_result["valid"], f"Schema validation failed: {validation_result['errors']}"
     
     # Additional assertions
     assert updated_product["id"] == product_id, "Product ID changed after update"
     assert updated_product["name"] == update_data["name"], "Product name not updated"
     assert updated_product["price"] == update_data["price"], "Product price not updated"
-    
-    # Clean up - delete the product
-    delete_url = f"{products_url}/{product_id}"
-    requests.delete(delete_url, headers=AUTH_HEADERS)
 
 
-def test_delete_product(products_url, product_data):
+def test_delete_product(http, products_url, created_product):
     """
     Test deleting a product.
     
     This test verifies that:
-    - First creates a product to delete
     - The DELETE endpoint returns 204 No Content
     - The product is actually deleted (404 when trying to fetch it)
     """
-    # First create a product
-    create_response = requests.post(products_url, json=product_data, headers=AUTH_HEADERS)
-    assert create_response.status_code == 201, "Failed to create test product for delete test"
-    
-    product_id = create_response.json()["id"]
+    product_id = created_product["id"]
     delete_url = f"{products_url}/{product_id}"
     
     # Send delete request
-    delete_response = requests.delete(delete_url, headers=AUTH_HEADERS)
+    delete_response = http.delete(delete_url)
     
     # Assertions
     assert delete_response.status_code == 204, f"Expected 204 No Content but got {delete_response.status_code}"
     
     # Verify product is deleted by trying to fetch it
-    get_response = requests.get(delete_url, headers=AUTH_HEADERS)
+    get_response = http.get(delete_url)
     assert get_response.status_code == 404, "Product still exists after deletion"
@@ -3,16 +3,32 @@ Utility functions for SmartTestAI framework.
 """
 import os
 import logging
-import datetime
+import time
 import json
 from typing import Dict, Any, Optional, Union
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Shared formatter; the format string is parsed once rather than per setup_logger call
+_FMT = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# Logger name -> (log_file, level) it was last configured with by setup_logger
+_LOGGER_CACHE: Dict[str, tuple] = {}
+
 def setup_logger(name: str = "smarttestai", 
                 log_file: Optional[str] = None, 
                 level: int = logging.INFO) -> logging.Logger:
     """
     Set up a logger with console and file handlers.
     
+    The logger does not propagate to the root logger, so records are only
+    formatted by the handlers installed here. Callers building expensive
+    debug messages should guard them with logger.isEnabledFor(logging.DEBUG).
+    
     Args:
         name: Logger name
         log_file: Path to log file (if None, no file handler is created)
@@ -22,19 +38,23 @@ def setup_logger(name: str = "smarttestai",
         Configured logger
     """
     logger = logging.getLogger(name)
+    
+    # Already configured identically - skip rebuilding handlers (and reopening log_file)
+    if _LOGGER_CACHE.get(name) == (log_file, level):
+        return logger
+    
     logger.setLevel(level)
+    logger.propagate = False
     
     # Remove existing handlers
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        handler.close()
     
     # Create console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
-    
-    # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(_FMT)
     
     # Add console handler to logger
     logger.addHandler(console_handler)
@@ -44,9 +64,10 @@ def setup_logger(name: str = "smarttestai",
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(_FMT)
         logger.addHandler(file_handler)
     
+    _LOGGER_CACHE[name] = (log_file, level)
     return logger
 
 def load_json_file(file_path: str) -> Dict[str, Any]:
@@ -59,6 +80,10 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
     Returns:
         Dictionary with file contents
     """
+    if ORJSON_AVAILABLE:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    
     with open(file_path, 'r') as f:
         return json.load(f)
     
@@ -70,6 +95,11 @@ def save_json_file(data: Dict[str, Any], file_path: str) -> None:
         data: Dictionary to save
         file_path: Path to output file
     """
+    if ORJSON_AVAILABLE:
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    
     with open(file_path, 'w') as f:
         json.dump(data, f, indent=2)
         
@@ -80,7 +110,7 @@ def get_timestamp() -> str:
     Returns:
         Formatted timestamp string
     """
-    return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return time.strftime("%Y%m%d_%H%M%S", time.localtime())
 
 def merge_dicts(dict1: Dict[str, Any], dict2: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -94,12 +124,18 @@ def merge_dicts(dict1: Dict[str, Any], dict2: Dict[str, Any]) -> Dict[str, Any]:
         Merged dictionary
     """
     result = dict1.copy()
+    stack = [(result, dict2)]
     
-    for key, value in dict2.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_dicts(result[key], value)
-        else:
-            result[key] = value
+    # Only dicts on merged paths are copied, so dict1 is never mutated
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            existing = dst.get(key)
+            if isinstance(existing, dict) and isinstance(value, dict):
+                dst[key] = existing.copy()
+                stack.append((dst[key], value))
+            else:
+                dst[key] = value
             
     return result
 
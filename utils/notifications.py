@@ -2,8 +2,10 @@
 Notification module for sending test results via Slack and email.
 """
 import os
+import html
 import smtplib
 import logging
+from itertools import islice
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, List, Optional, Any, Union
@@ -11,6 +13,7 @@ from typing import Dict, List, Optional, Any, Union
 try:
     from slack_sdk import WebClient
     from slack_sdk.errors import SlackApiError
+    from slack_sdk.webhook import WebhookClient
     SLACK_AVAILABLE = True
 except ImportError:
     SLACK_AVAILABLE = False
@@ -18,6 +21,51 @@ except ImportError:
 class NotificationSender:
     """Sends test result notifications via Slack and email."""
     
+    # Email body skeletons; only the summary fields are substituted per send
+    _HTML_TEMPLATE = """
+        <html>
+        <body>
+            <h1>{title}</h1>
+            <table width="100%" cellpadding="5" cellspacing="0">
+                <tr>
+                    <td><strong>Total Tests:</strong></td>
+                    <td>{total}</td>
+                    <td><strong>Status:</strong></td>
+                    <td>{html_status}</td>
+                </tr>
+                <tr>
+                    <td><strong>Passed:</strong></td>
+                    <td>{passed} ({pass_pct:.1f}%)</td>
+                    <td><strong>Failed:</strong></td>
+                    <td>{failed}</td>
+                </tr>
+            </table>
+            <p>Duration: {duration:.2f} seconds</p>
+        {failures_section}
+        <hr>
+        <p><em>Generated by SmartTestAI - Automated Testing Framework</em></p>
+        </body>
+        </html>
+        """
+    
+    _HTML_FAILURE_ITEM = """
+                    <li>
+                        <strong>{name}</strong><br/>
+                        {message}
+                    </li>
+                    """
+    
+    _TEXT_TEMPLATE = """
+        {title}
+        
+        Total Tests: {total}
+        Status: {text_status}
+        Passed: {passed} ({pass_pct:.1f}%)
+        Failed: {failed}
+        
+        Duration: {duration:.2f} seconds
+        """
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the notification sender with configuration.
@@ -28,6 +76,41 @@ class NotificationSender:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
+        # Slack clients are created on first use and reused so their
+        # underlying connection pools survive across notifications
+        self._slack_webhook = None
+        self._slack_client = None
+        
+        # SMTP connection is opened lazily and kept for subsequent emails
+        self._smtp: Optional[smtplib.SMTP] = None
+        
+    def close(self) -> None:
+        """Close any cached SMTP connection."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            finally:
+                self._smtp = None
+        
+    def _get_smtp(self, email_config: Dict[str, Any]) -> smtplib.SMTP:
+        """Return the cached SMTP connection, connecting and authenticating on first use."""
+        if self._smtp is None:
+            server = smtplib.SMTP(email_config.get("smtp_server"), email_config.get("port", 587))
+            try:
+                if email_config.get("use_tls", True):
+                    server.starttls()
+                    
+                if email_config.get("username") and email_config.get("password"):
+                    server.login(email_config.get("username"), email_config.get("password"))
+            except Exception:
+                server.close()
+                raise
+            self._smtp = server
+            
+        return self._smtp
+        
     def send_slack_notification(self, summary: Dict[str, Any], 
                                detailed: bool = False) -> bool:
         """
@@ -54,8 +137,6 @@ class NotificationSender:
             self.logger.error("Slack webhook URL not provided in config.")
             return False
             
-        # Create client
-        client = WebClient(token=os.environ.get("SLACK_BOT_TOKEN", ""))
         channel = slack_config.get("channel", "#api-testing")
         
         # Create message blocks
@@ -65,16 +146,18 @@ class NotificationSender:
             # Send message
             if webhook_url.startswith("https://hooks.slack.com"):
                 # Using webhook
-                from slack_sdk.webhook import WebhookClient
-                webhook_client = WebhookClient(webhook_url)
-                response = webhook_client.send(
+                if self._slack_webhook is None:
+                    self._slack_webhook = WebhookClient(webhook_url)
+                response = self._slack_webhook.send(
                     text=f"Test Run Summary: {summary.get('title', 'SmartTestAI Results')}",
                     blocks=blocks
                 )
                 return response.status_code == 200
             else:
                 # Using bot token
-                response = client.chat_postMessage(
+                if self._slack_client is None:
+                    self._slack_client = WebClient(token=os.environ.get("SLACK_BOT_TOKEN", ""))
+                response = self._slack_client.chat_postMessage(
                     channel=channel,
                     text=f"Test Run Summary: {summary.get('title', 'SmartTestAI Results')}",
                     blocks=blocks
@@ -106,8 +189,6 @@ class NotificationSender:
             return False
             
         smtp_server = email_config.get("smtp_server")
-        port = email_config.get("port", 587)
-        use_tls = email_config.get("use_tls", True)
         
         from_email = email_config.get("from_email")
         recipients = email_config.get("recipients", [])
@@ -120,20 +201,18 @@ class NotificationSender:
         message = self._create_email_message(summary, detailed, from_email, recipients)
         
         try:
-            # Send email
-            with smtplib.SMTP(smtp_server, port) as server:
-                if use_tls:
-                    server.starttls()
-                    
-                if email_config.get("username") and email_config.get("password"):
-                    server.login(email_config.get("username"), email_config.get("password"))
-                    
-                server.send_message(message)
+            # Send email, reconnecting once if the cached connection was dropped
+            try:
+                self._get_smtp(email_config).send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                self._smtp = None
+                self._get_smtp(email_config).send_message(message)
                 
             return True
             
         except Exception as e:
             self.logger.error(f"Error sending email notification: {e}")
+            self.close()
             return False
             
     def _create_slack_message_blocks(self, summary: Dict[str, Any], 
@@ -213,7 +292,7 @@ class NotificationSender:
                     }
                 })
                 
-                for i, failure in enumerate(failures[:5]):  # Limit to 5 failures
+                for i, failure in enumerate(islice(failures, 5)):  # Limit to 5 failures
                     blocks.append({
                         "type": "section",
                         "text": {
@@ -222,13 +301,14 @@ class NotificationSender:
                         }
                     })
                     
-                if len(failures) > 5:
+                remaining = len(failures) - 5
+                if remaining > 0:
                     blocks.append({
                         "type": "context",
                         "elements": [
                             {
                                 "type": "mrkdwn",
-                                "text": f"_...and {len(failures) - 5} more failures_"
+                                "text": f"_...and {remaining} more failures_"
                             }
                         ]
                     })
@@ -254,75 +334,51 @@ class NotificationSender:
         if total > 0:
             pass_percentage = (passed / total) * 100
             
-        # Create HTML content
-        html_content = f"""
-        <html>
-        <body>
-            <h1>{title}</h1>
-            <table width="100%" cellpadding="5" cellspacing="0">
-                <tr>
-                    <td><strong>Total Tests:</strong></td>
-                    <td>{total}</td>
-                    <td><strong>Status:</strong></td>
-                    <td>{'✅ All Passed' if failed == 0 else '❌ Some Tests Failed'}</td>
-                </tr>
-                <tr>
-                    <td><strong>Passed:</strong></td>
-                    <td>{passed} ({pass_percentage:.1f}%)</td>
-                    <td><strong>Failed:</strong></td>
-                    <td>{failed}</td>
-                </tr>
-            </table>
-            <p>Duration: {duration:.2f} seconds</p>
-        """
-        
-        # Add failures if detailed and any tests failed
-        if detailed and failed > 0:
-            failures = summary.get("failures", [])
-            if failures:
-                html_content += "<h2>Failed Tests:</h2><ul>"
-                
-                for failure in failures:
-                    html_content += f"""
-                    <li>
-                        <strong>{failure.get('name', 'Unknown Test')}</strong><br/>
-                        {failure.get('message', 'No error message')}
-                    </li>
-                    """
-                    
-                html_content += "</ul>"
-                
-        html_content += """
-        <hr>
-        <p><em>Generated by SmartTestAI - Automated Testing Framework</em></p>
-        </body>
-        </html>
-        """
+        stats = {
+            "title": title,
+            "total": total,
+            "passed": passed,
+            "failed": failed,
+            "pass_pct": pass_percentage,
+            "duration": duration,
+            "html_status": '✅ All Passed' if failed == 0 else '❌ Some Tests Failed',
+            "text_status": 'All Passed' if failed == 0 else 'Some Tests Failed',
+        }
         
-        # Create plain text version as fallback
-        text_content = f"""
-        {title}
+        failures = summary.get("failures", []) if detailed and failed > 0 else []
         
-        Total Tests: {total}
-        Status: {'All Passed' if failed == 0 else 'Some Tests Failed'}
-        Passed: {passed} ({pass_percentage:.1f}%)
-        Failed: {failed}
+        # Create HTML content
+        failures_section = ""
+        if failures:
+            failure_items = "".join(
+                self._HTML_FAILURE_ITEM.format(
+                    name=html.escape(str(failure.get('name', 'Unknown Test'))),
+                    message=html.escape(str(failure.get('message', 'No error message')))
+                )
+                for failure in failures
+            )
+            failures_section = f"<h2>Failed Tests:</h2><ul>{failure_items}</ul>"
         
-        Duration: {duration:.2f} seconds
-        """
+        html_content = self._HTML_TEMPLATE.format_map({
+            **stats,
+            "title": html.escape(str(title)),
+            "failures_section": failures_section,
+        })
         
-        if detailed and failed > 0:
-            failures = summary.get("failures", [])
+        # Create plain text version as fallback unless disabled for HTML-only recipients
+        if self.config.get("email", {}).get("include_plain_text", True):
+            text_content = self._TEXT_TEMPLATE.format_map(stats)
+            
             if failures:
-                text_content += "\nFailed Tests:\n"
-                
-                for failure in failures:
-                    text_content += f"- {failure.get('name', 'Unknown Test')}: {failure.get('message', 'No error message')}\n"
-        
-        text_content += "\nGenerated by SmartTestAI - Automated Testing Framework"
+                text_content += "\nFailed Tests:\n" + "".join(
+                    f"- {failure.get('name', 'Unknown Test')}: {failure.get('message', 'No error message')}\n"
+                    for failure in failures
+                )
+            
+            text_content += "\nGenerated by SmartTestAI - Automated Testing Framework"
+            message.attach(MIMEText(text_content, "plain"))
         
-        # Attach both versions to the email
-        message.attach(MIMEText(text_content, "plain"))
+        # HTML goes last so clients prefer it in multipart/alternative
         message.attach(MIMEText(html_content, "html"))
         
         return message
@@ -1,14 +1,101 @@
 """
 Report generator module for SmartTestAI framework.
 Generates HTML and JSON reports from test results.
+
+JUnit XML is built with lxml on CPython. Under PyPy the stdlib ElementTree is
+used instead: lxml goes through PyPy's slow C-API emulation, while the
+pure-Python tree code is compiled by the JIT.
 """
 import os
+import sys
 import json
+import time
+import platform
 import datetime
+import itertools
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_IS_PYPY = platform.python_implementation() == "PyPy"
+
+# lxml builds and pretty-prints the JUnit tree in libxml2 in a single pass;
+# fall back to ElementTree when it is not installed or under PyPy
+LXML_AVAILABLE = False
+if not _IS_PYPY:
+    try:
+        from lxml import etree as ET
+        LXML_AVAILABLE = True
+    except ImportError:
+        pass
+
+if not LXML_AVAILABLE:
+    import xml.etree.ElementTree as ET
+    # ElementTree.indent (3.9+) pretty-prints the tree in place; older
+    # versions re-parse the output with minidom
+    if sys.version_info < (3, 9):
+        from xml.dom import minidom
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+_HTML_STATUS_CLASS = {"pass": "status-pass", "fail": "status-fail", "skip": "status-skip"}
+_MD_STATUS_ICON = {"pass": "✅ PASS", "fail": "❌ FAIL", "skip": "⚠️ SKIP"}
+
+
+def _status_class(status: str) -> str:
+    """Jinja filter: CSS class for a test status."""
+    return _HTML_STATUS_CLASS.get(status.lower(), "")
+
+
+def _status_icon(status: str) -> str:
+    """Jinja filter: Markdown label for a test status."""
+    return _MD_STATUS_ICON.get(status.lower(), status.upper())
+
+
+# Markdown table cells: newlines become <br> and pipes are escaped so a cell
+# can't break the table row
+_MD_CELL_TRANS = str.maketrans({"\n": "<br>", "|": "\\|", "\r": ""})
+
+
+def _md_cell(value: Any) -> str:
+    """Jinja filter: make a value safe to place in a Markdown table cell."""
+    if value is None:
+        return ""
+    return str(value).translate(_MD_CELL_TRANS)
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Serialise values JSON has no type for, the same way for orjson and json.
+    
+    Dates and times become ISO strings (naive values stay naive), NumPy arrays
+    and scalars become lists/numbers via tolist(), anything else becomes str().
+    """
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    tolist = getattr(obj, "tolist", None)
+    if callable(tolist):
+        return tolist()
+    return str(obj)
+
+
+def _write_bytes(file_path: str, data: bytes) -> None:
+    """Write an already-encoded payload straight to a file descriptor."""
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
 
 class ReportGenerator:
     """Generates reports from test results in various formats."""
@@ -23,6 +110,25 @@ class ReportGenerator:
         self.output_dir = output_dir or './reports'
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # Per-generator sequence for report filenames; together with the ns
+        # clock it keeps reports written within the same second apart
+        self._seq = itertools.count()
+        
+        # Templates are compiled once per generator and reused for every report.
+        # HTML output is autoescaped (markupsafe); Markdown is left as-is.
+        self._env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            auto_reload=False,
+            autoescape=select_autoescape(enabled_extensions=("html", "xml", "html.j2", "xml.j2")),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        self._env.filters["status_class"] = _status_class
+        self._env.filters["status_icon"] = _status_icon
+        self._env.filters["md_cell"] = _md_cell
+        self._html_tmpl = self._env.get_template("report.html.j2")
+        self._md_tmpl = self._env.get_template("report.md.j2")
+        
     def generate_html_report(self, test_results: Dict[str, Any], 
                             title: str = "SmartTestAI Test Report") -> str:
         """
@@ -35,16 +141,17 @@ class ReportGenerator:
         Returns:
             Path to the generated HTML report
         """
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"report_{timestamp}.html"
+        now = datetime.datetime.now()
+        filename = f"report_{next(self._seq):06d}_{time.time_ns()}.html"
         file_path = os.path.join(self.output_dir, filename)
         
         # Extract results
-        total_tests = test_results.get("summary", {}).get("total", 0)
-        passed = test_results.get("summary", {}).get("passed", 0)
-        failed = test_results.get("summary", {}).get("failed", 0)
-        skipped = test_results.get("summary", {}).get("skipped", 0)
-        duration = test_results.get("summary", {}).get("duration", 0)
+        summary = test_results.get("summary") or {}
+        total_tests = summary.get("total", 0)
+        passed = summary.get("passed", 0)
+        failed = summary.get("failed", 0)
+        skipped = summary.get("skipped", 0)
+        duration = summary.get("duration", 0)
         tests = test_results.get("tests", [])
         
         # Calculate pass percentage
@@ -52,201 +159,23 @@ class ReportGenerator:
         if total_tests > 0:
             pass_percentage = (passed / total_tests) * 100
         
-        # Generate HTML content
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            margin: 0;
-            padding: 20px;
-            background-color: #f7f9fc;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background-color: #fff;
-            padding: 30px;
-            border-radius: 8px;
-            box-shadow: 0 0 10px rgba(0,0,0,0.05);
-        }}
-        h1 {{
-            color: #2c3e50;
-            margin-top: 0;
-            border-bottom: 2px solid #eee;
-            padding-bottom: 10px;
-        }}
-        .summary {{
-            display: flex;
-            justify-content: space-between;
-            flex-wrap: wrap;
-            margin-bottom: 30px;
-        }}
-        .summary-box {{
-            padding: 15px;
-            border-radius: 5px;
-            flex: 1;
-            margin: 0 10px 10px 0;
-            text-align: center;
-            min-width: 150px;
-        }}
-        .total {{
-            background-color: #f1f8ff;
-            border-left: 5px solid #4a69bd;
-        }}
-        .passed {{
-            background-color: #e8f5e9;
-            border-left: 5px solid #4CAF50;
-        }}
-        .failed {{
-            background-color: #ffebee;
-            border-left: 5px solid #f44336;
-        }}
-        .skipped {{
-            background-color: #fff8e1;
-            border-left: 5px solid #ffb300;
-        }}
-        .time {{
-            background-color: #f3e5f5;
-            border-left: 5px solid #8e24aa;
-        }}
-        .test-results {{
-            border-collapse: collapse;
-            width: 100%;
-            margin-top: 20px;
-        }}
-        .test-results th, .test-results td {{
-            border: 1px solid #ddd;
-            padding: 12px 15px;
-            text-align: left;
-        }}
-        .test-results th {{
-            background-color: #f8f9fa;
-        }}
-        .test-results tr:nth-child(even) {{
-            background-color: #f9f9f9;
-        }}
-        .test-results tr:hover {{
-            background-color: #f2f2f2;
-        }}
-        .status-pass {{
-            color: #4CAF50;
-            font-weight: bold;
-        }}
-        .status-fail {{
-            color: #f44336;
-            font-weight: bold;
-        }}
-        .status-skip {{
-            color: #ffb300;
-            font-weight: bold;
-        }}
-        .error-details {{
-            background-color: #fff8f8;
-            border-left: 4px solid #f44336;
-            padding: 10px;
-            margin: 10px 0;
-            font-family: monospace;
-            white-space: pre-wrap;
-            overflow-x: auto;
-        }}
-        footer {{
-            margin-top: 30px;
-            text-align: center;
-            color: #7f8c8d;
-            font-size: 0.9em;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>{title}</h1>
-        <div class="summary">
-            <div class="summary-box total">
-                <h3>Total Tests</h3>
-                <p>{total_tests}</p>
-            </div>
-            <div class="summary-box passed">
-                <h3>Passed</h3>
-                <p>{passed} ({pass_percentage:.1f}%)</p>
-            </div>
-            <div class="summary-box failed">
-                <h3>Failed</h3>
-                <p>{failed}</p>
-            </div>
-            <div class="summary-box skipped">
-                <h3>Skipped</h3>
-                <p>{skipped}</p>
-            </div>
-            <div class="summary-box time">
-                <h3>Duration</h3>
-                <p>{duration:.2f}s</p>
-            </div>
-        </div>
-
-        <h2>Test Details</h2>
-        <table class="test-results">
-            <thead>
-                <tr>
-                    <th>#</th>
-                    <th>Test Name</th>
-                    <th>Status</th>
-                    <th>Duration</th>
-                    <th>Details</th>
-                </tr>
-            </thead>
-            <tbody>
-        """
-        
-        for i, test in enumerate(tests):
-            test_name = test.get("name", f"Test {i+1}")
-            status = test.get("status", "")
-            test_duration = test.get("duration", 0)
-            details = test.get("details", "")
-            error = test.get("error", "")
-            
-            status_class = ""
-            if status.lower() == "pass":
-                status_class = "status-pass"
-            elif status.lower() == "fail":
-                status_class = "status-fail"
-            elif status.lower() == "skip":
-                status_class = "status-skip"
-            
-            html_content += f"""
-                <tr>
-                    <td>{i+1}</td>
-                    <td>{test_name}</td>
-                    <td class="{status_class}">{status.upper()}</td>
-                    <td>{test_duration:.2f}s</td>
-                    <td>
-                        {details}
-                        {f'<div class="error-details">{error}</div>' if error else ''}
-                    </td>
-                </tr>
-            """
-        
-        html_content += """
-            </tbody>
-        </table>
-        
-        <footer>
-            <p>Generated by SmartTestAI on """ + datetime.datetime.now().strftime("%Y-%m-%d at %H:%M:%S") + """</p>
-        </footer>
-    </div>
-</body>
-</html>
-        """
+        # Stream the rendered template straight to disk so only the current
+        # chunk is held in memory, not the whole document
+        stream = self._html_tmpl.stream(
+            title=title,
+            total_tests=total_tests,
+            passed=passed,
+            failed=failed,
+            skipped=skipped,
+            duration=duration,
+            pass_percentage=pass_percentage,
+            tests=tests,
+            generated_at=now.strftime("%Y-%m-%d at %H:%M:%S")
+        )
         
         # Write HTML to file
-        with open(file_path, "w") as f:
-            f.write(html_content)
+        with open(file_path, "wb", buffering=1 << 20) as f:
+            stream.dump(f, encoding="utf-8")
             
         return file_path
     
@@ -260,20 +189,28 @@ class ReportGenerator:
         Returns:
             Path to the generated JSON report
         """
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"report_{timestamp}.json"
+        now = datetime.datetime.now()
+        filename = f"report_{next(self._seq):06d}_{time.time_ns()}.json"
         file_path = os.path.join(self.output_dir, filename)
         
         # Add metadata
         report_data = test_results.copy()
         report_data["metadata"] = {
-            "generated_at": datetime.datetime.now().isoformat(),
+            "generated_at": now.isoformat(),
             "generator": "SmartTestAI Report Generator"
         }
         
         # Write JSON to file
-        with open(file_path, "w") as f:
-            json.dump(report_data, f, indent=2)
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(
+                report_data,
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            data = json.dumps(report_data, indent=2, default=_json_default).encode("utf-8")
+            
+        _write_bytes(file_path, data)
             
         return file_path
     
@@ -287,51 +224,59 @@ class ReportGenerator:
         Returns:
             Path to the generated XML report
         """
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"report_{timestamp}.xml"
+        now = datetime.datetime.now()
+        filename = f"report_{next(self._seq):06d}_{time.time_ns()}.xml"
         file_path = os.path.join(self.output_dir, filename)
         
         # Extract results
+        summary = test_results.get("summary") or {}
         tests = test_results.get("tests", [])
-        total_tests = test_results.get("summary", {}).get("total", 0)
-        failures = test_results.get("summary", {}).get("failed", 0)
-        skipped = test_results.get("summary", {}).get("skipped", 0)
-        duration = test_results.get("summary", {}).get("duration", 0)
+        total_tests = summary.get("total", 0)
+        failures = summary.get("failed", 0)
+        skipped = summary.get("skipped", 0)
+        duration = summary.get("duration", 0)
         
-        # Create XML structure
-        test_suite = ET.Element("testsuite")
-        test_suite.set("name", "SmartTestAI Tests")
-        test_suite.set("tests", str(total_tests))
-        test_suite.set("failures", str(failures))
-        test_suite.set("skips", str(skipped))
-        test_suite.set("time", str(duration))
-        test_suite.set("timestamp", datetime.datetime.now().isoformat())
+        # Create XML structure; attributes go in with the element in one call
+        test_suite = ET.Element("testsuite", {
+            "name": "SmartTestAI Tests",
+            "tests": str(total_tests),
+            "failures": str(failures),
+            "skips": str(skipped),
+            "time": str(duration),
+            "timestamp": now.isoformat()
+        })
         
         # Add test cases
+        sub_element = ET.SubElement
         for test in tests:
-            test_case = ET.SubElement(test_suite, "testcase")
-            test_case.set("name", test.get("name", "Unknown Test"))
-            test_case.set("classname", test.get("classname", "APITest"))
-            test_case.set("time", str(test.get("duration", 0)))
+            test_case = sub_element(test_suite, "testcase", {
+                "name": test.get("name", "Unknown Test"),
+                "classname": test.get("classname", "APITest"),
+                "time": str(test.get("duration", 0))
+            })
             
             status = test.get("status", "").lower()
             if status == "fail":
-                failure = ET.SubElement(test_case, "failure")
-                failure.set("message", test.get("message", "Test failed"))
-                failure.set("type", test.get("error_type", "AssertionError"))
+                failure = sub_element(test_case, "failure", {
+                    "message": test.get("message", "Test failed"),
+                    "type": test.get("error_type", "AssertionError")
+                })
                 failure.text = test.get("error", "")
             elif status == "skip":
-                skipped_el = ET.SubElement(test_case, "skipped")
-                skipped_el.set("message", test.get("message", "Test skipped"))
+                sub_element(test_case, "skipped", {"message": test.get("message", "Test skipped")})
         
         # Convert to string and pretty print
-        xml_str = ET.tostring(test_suite, encoding="utf-8")
-        parsed_xml = minidom.parseString(xml_str)
-        pretty_xml = parsed_xml.toprettyxml(indent="  ")
-        
-        # Write to file
-        with open(file_path, "w") as f:
-            f.write(pretty_xml)
+        if LXML_AVAILABLE:
+            pretty_xml = ET.tostring(test_suite, pretty_print=True, xml_declaration=True, encoding="utf-8")
+        elif sys.version_info >= (3, 9):
+            ET.indent(test_suite, space="  ")
+            pretty_xml = ET.tostring(test_suite, encoding="utf-8", xml_declaration=True) + b"\n"
+        else:
+            xml_str = ET.tostring(test_suite, encoding="utf-8")
+            parsed_xml = minidom.parseString(xml_str)
+            pretty_xml = parsed_xml.toprettyxml(indent="  ").encode("utf-8")
+            
+        _write_bytes(file_path, pretty_xml)
             
         return file_path
     
@@ -347,16 +292,17 @@ class ReportGenerator:
         Returns:
             Path to the generated Markdown report
         """
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"report_{timestamp}.md"
+        now = datetime.datetime.now()
+        filename = f"report_{next(self._seq):06d}_{time.time_ns()}.md"
         file_path = os.path.join(self.output_dir, filename)
         
         # Extract results
-        total_tests = test_results.get("summary", {}).get("total", 0)
-        passed = test_results.get("summary", {}).get("passed", 0)
-        failed = test_results.get("summary", {}).get("failed", 0)
-        skipped = test_results.get("summary", {}).get("skipped", 0)
-        duration = test_results.get("summary", {}).get("duration", 0)
+        summary = test_results.get("summary") or {}
+        total_tests = summary.get("total", 0)
+        passed = summary.get("passed", 0)
+        failed = summary.get("failed", 0)
+        skipped = summary.get("skipped", 0)
+        duration = summary.get("duration", 0)
         tests = test_results.get("tests", [])
         
         # Calculate pass percentage
@@ -364,43 +310,20 @@ class ReportGenerator:
         if total_tests > 0:
             pass_percentage = (passed / total_tests) * 100
             
-        # Generate markdown content
-        md_content = f"# {title}\n\n"
-        md_content += f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        md_content += "## Summary\n\n"
-        md_content += f"- **Total Tests:** {total_tests}\n"
-        md_content += f"- **Passed:** {passed} ({pass_percentage:.1f}%)\n"
-        md_content += f"- **Failed:** {failed}\n"
-        md_content += f"- **Skipped:** {skipped}\n"
-        md_content += f"- **Duration:** {duration:.2f} seconds\n\n"
-        
-        md_content += "## Test Details\n\n"
-        md_content += "| # | Test Name | Status | Duration | Details |\n"
-        md_content += "|---|-----------|--------|----------|--------|\n"
-        
-        for i, test in enumerate(tests):
-            test_name = test.get("name", f"Test {i+1}")
-            status = test.get("status", "")
-            test_duration = test.get("duration", 0)
-            details = test.get("details", "").replace("\n", "<br>")
-            
-            status_formatted = status.upper()
-            if status.lower() == "pass":
-                status_formatted = "✅ PASS"
-            elif status.lower() == "fail":
-                status_formatted = "❌ FAIL"
-            elif status.lower() == "skip":
-                status_formatted = "⚠️ SKIP"
-                
-            md_content += f"| {i+1} | {test_name} | {status_formatted} | {test_duration:.2f}s | {details} |\n"
-            
-            if status.lower() == "fail" and test.get("error"):
-                md_content += f"\n<details><summary>Error Details</summary>\n\n```\n{test.get('error')}\n```\n\n</details>\n\n"
-        
-        md_content += "\n---\n*Generated by SmartTestAI - Automated Testing Framework*"
+        stream = self._md_tmpl.stream(
+            title=title,
+            total_tests=total_tests,
+            passed=passed,
+            failed=failed,
+            skipped=skipped,
+            duration=duration,
+            pass_percentage=pass_percentage,
+            tests=tests,
+            generated_at=now.strftime('%Y-%m-%d %H:%M:%S')
+        )
         
         # Write to file
-        with open(file_path, "w") as f:
-            f.write(md_content)
+        with open(file_path, "wb", buffering=1 << 20) as f:
+            stream.dump(f, encoding="utf-8")
             
         return file_path
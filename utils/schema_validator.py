@@ -1,10 +1,201 @@
 """
 JSON Schema validator utility for API response validation.
 """
-import json
+import os
+import sys
+import functools
+import threading
+from collections import OrderedDict
 import jsonschema
-from jsonschema import validate, ValidationError
-from typing import Any, Dict, List, Union, Optional
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+from typing import Any, Callable, Dict, List, Tuple, Union, Optional
+
+from utils import load_json_file
+
+# fastjsonschema compiles each schema into a Python function once, instead of
+# re-walking the schema on every validation. The generated code is plain
+# Python, so it is used under PyPy as well.
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+
+def _compile_schema(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """
+    Compile a schema with fastjsonschema.
+    
+    Formats are not enforced and defaults are not injected, matching
+    jsonschema.validate's behaviour.
+    """
+    return fastjsonschema.compile(schema, use_default=False, use_formats=False)
+
+
+def _schema_key(schema_path: str) -> Tuple[str, int]:
+    """Cache key for a schema file: (real path, modification time in ns)."""
+    real_path = os.path.realpath(schema_path)
+    return real_path, os.stat(real_path).st_mtime_ns
+
+
+# Parsed schema files, shared by every SchemaValidator in the process
+_SCHEMA_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def _load_schema_file(key: Tuple[str, int]) -> Dict[str, Any]:
+    """Return the parsed schema file identified by a _schema_key, reading it once."""
+    with _SCHEMA_CACHE_LOCK:
+        schema = _SCHEMA_CACHE.get(key)
+    if schema is not None:
+        return schema
+        
+    schema = load_json_file(key[0])
+    with _SCHEMA_CACHE_LOCK:
+        # Drop entries for earlier versions of the same file
+        for stale in [k for k in _SCHEMA_CACHE if k[0] == key[0] and k != key]:
+            del _SCHEMA_CACHE[stale]
+        return _SCHEMA_CACHE.setdefault(key, schema)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_schema_file(key: Tuple[str, int]) -> Callable[[Any], Any]:
+    """Compile the schema file identified by a _schema_key, once per process."""
+    return _compile_schema(_load_schema_file(key))
+
+
+# JSON schema type for each exact Python type; type(value) is looked up here
+# before falling back to isinstance checks for subclasses
+_JSON_TYPES = {
+    type(None): "null",
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    str: "string",
+    list: "array",
+    dict: "object"
+}
+
+# JSON schema type for each NumPy dtype kind
+_NUMPY_KIND_TYPES = {
+    "b": "boolean",
+    "i": "integer",
+    "u": "integer",
+    "f": "number",
+    "U": "string",
+    "S": "string"
+}
+
+
+def _json_type_of(value: Any) -> str:
+    """JSON schema type for values whose exact type is not in _JSON_TYPES."""
+    if isinstance(value, bool):
+        return "boolean"
+    elif isinstance(value, int):
+        return "integer"
+    elif isinstance(value, float):
+        return "number"
+    elif isinstance(value, list):
+        return "array"
+    elif isinstance(value, dict):
+        return "object"
+    
+    # NumPy arrays and scalars are typed from their dtype. A value can only be
+    # a NumPy object if NumPy is already imported, so it is never imported here.
+    numpy = sys.modules.get("numpy")
+    if numpy is not None:
+        # 0-d arrays hold a single value and are typed like NumPy scalars
+        if isinstance(value, numpy.ndarray) and value.ndim:
+            return "array"
+        elif isinstance(value, (numpy.generic, numpy.ndarray)):
+            return _NUMPY_KIND_TYPES.get(value.dtype.kind, "string")
+            
+    # Default fallback
+    return "string"
+
+
+def _infer_type_schema(value: Any) -> Dict[str, Any]:
+    """
+    Infer a schema from a value.
+    
+    Nested values are walked with an explicit stack rather than recursion, so
+    deeply nested examples can't hit the recursion limit. Each stack entry is
+    (schema dict to fill in, value it describes).
+    """
+    root: Dict[str, Any] = {}
+    stack = [(root, value)]
+    pop = stack.pop
+    push = stack.append
+    json_type_for = _JSON_TYPES.get
+    
+    while stack:
+        schema, value = pop()
+        json_type = json_type_for(type(value)) or _json_type_of(value)
+        schema["type"] = json_type
+        
+        if json_type == "array":
+            # Use the first item to infer array item type
+            items: Dict[str, Any] = {}
+            schema["items"] = items
+            if len(value):
+                push((items, value[0]))
+                
+        elif json_type == "object":
+            properties: Dict[str, Any] = {}
+            schema["properties"] = properties
+            for k, v in value.items():
+                properties[k] = child = {}
+                push((child, v))
+                
+    return root
+
+
+def _build_validator(schema: Dict[str, Any]) -> Any:
+    """
+    Build a reusable jsonschema validator for a schema.
+    
+    Picks the draft the way jsonschema.validate does and checks the schema
+    once here rather than on every validation.
+    """
+    validator_cls = validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+@functools.lru_cache(maxsize=256)
+def _validator_for_file(key: Tuple[str, int]) -> Any:
+    """Build the jsonschema validator for a schema file identified by a _schema_key."""
+    return _build_validator(_load_schema_file(key))
+
+
+# Validators for inline schema dicts, keyed by id(). The dict is kept alongside
+# its validator so the id can't be reused while cached; each cache is a small
+# LRU so per-call schema literals don't pile up.
+_INLINE_CACHE_SIZE = 64
+_INLINE_COMPILED: "OrderedDict[int, Tuple[Dict[str, Any], Any]]" = OrderedDict()
+_INLINE_VALIDATORS: "OrderedDict[int, Tuple[Dict[str, Any], Any]]" = OrderedDict()
+
+
+def _inline_lookup(cache: "OrderedDict[int, Tuple[Dict[str, Any], Any]]",
+                   schema: Dict[str, Any], build: Callable[[Dict[str, Any]], Any]) -> Any:
+    """Return build(schema) from an inline-schema LRU cache, building it on a miss."""
+    key = id(schema)
+    with _SCHEMA_CACHE_LOCK:
+        cached = cache.get(key)
+        if cached is not None and cached[0] is schema:
+            cache.move_to_end(key)
+            return cached[1]
+            
+    built = build(schema)
+    with _SCHEMA_CACHE_LOCK:
+        cache[key] = (schema, built)
+        cache.move_to_end(key)
+        if len(cache) > _INLINE_CACHE_SIZE:
+            cache.popitem(last=False)
+    return built
+
 
 class SchemaValidator:
     """Validates API responses against JSON schemas."""
@@ -17,7 +208,9 @@ class SchemaValidator:
             schema_dir: Directory containing schema files (optional)
         """
         self.schema_dir = schema_dir
-        self.schema_cache: Dict[str, Dict[str, Any]] = {}
+        # Parsed schema files live in the module-level cache so they outlive
+        # any one validator; schema_cache is kept as a view of it
+        self.schema_cache: Dict[Tuple[str, int], Dict[str, Any]] = _SCHEMA_CACHE
         
     def validate_response(self, response_data: Any, schema: Union[Dict[str, Any], str]) -> bool:
         """
@@ -33,14 +226,38 @@ class SchemaValidator:
         Raises:
             ValidationError: If validation fails
         """
-        # If schema is a string, it's a file path
+        if FASTJSONSCHEMA_AVAILABLE:
+            try:
+                self._get_compiled(schema)(response_data)
+                return True
+            except fastjsonschema.JsonSchemaValueException as e:
+                # Failures are the rare path: re-check with jsonschema so
+                # callers get the same ValidationError either way
+                error = best_match(self._get_validator(schema).iter_errors(response_data))
+                if error is None:
+                    # e.path starts with the root name ("data"); drop it
+                    error = ValidationError(e.message, path=e.path[1:], validator=e.rule)
+                raise error from None
+                
+        # Report the same error jsonschema.validate would raise
+        error = best_match(self._get_validator(schema).iter_errors(response_data))
+        if error is not None:
+            raise error
+        return True
+    
+    def _get_compiled(self, schema: Union[Dict[str, Any], str]) -> Callable[[Any], Any]:
+        """Return the compiled validator for a schema dict or schema file path."""
         if isinstance(schema, str):
-            schema_dict = self._load_schema(schema)
-        else:
-            schema_dict = schema
+            return _compile_schema_file(_schema_key(schema))
             
-        validate(instance=response_data, schema=schema_dict)
-        return True
+        return _inline_lookup(_INLINE_COMPILED, schema, _compile_schema)
+        
+    def _get_validator(self, schema: Union[Dict[str, Any], str]) -> Any:
+        """Return the jsonschema validator for a schema dict or schema file path."""
+        if isinstance(schema, str):
+            return _validator_for_file(_schema_key(schema))
+            
+        return _inline_lookup(_INLINE_VALIDATORS, schema, _build_validator)
         
     def validate_response_safe(self, response_data: Any, 
                               schema: Union[Dict[str, Any], str]) -> Dict[str, Any]:
@@ -80,20 +297,26 @@ class SchemaValidator:
         """
         Load a schema from file with caching.
         
+        Entries are keyed by real path and modification time, so different
+        spellings of the same path share an entry and edited files are reread.
+        
         Args:
             schema_path: Path to the schema file
             
         Returns:
             Schema as dict
         """
-        if schema_path in self.schema_cache:
-            return self.schema_cache[schema_path]
-            
-        with open(schema_path, 'r') as f:
-            schema = json.load(f)
-            
-        self.schema_cache[schema_path] = schema
-        return schema
+        return _load_schema_file(_schema_key(schema_path))
+        
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop cached schemas and validators (files and inline dicts) for all instances."""
+        with _SCHEMA_CACHE_LOCK:
+            _SCHEMA_CACHE.clear()
+            _INLINE_COMPILED.clear()
+            _INLINE_VALIDATORS.clear()
+        _compile_schema_file.cache_clear()
+        _validator_for_file.cache_clear()
     
     def generate_schema_from_example(self, example_data: Any) -> Dict[str, Any]:
         """
@@ -127,33 +350,4 @@ class SchemaValidator:
         
     def _infer_type_schema(self, value: Any) -> Dict[str, Any]:
         """Infer schema type from a value."""
-        if value is None:
-            return {"type": "null"}
-            
-        elif isinstance(value, bool):
-            return {"type": "boolean"}
-            
-        elif isinstance(value, int):
-            return {"type": "integer"}
-            
-        elif isinstance(value, float):
-            return {"type": "number"}
-            
-        elif isinstance(value, str):
-            return {"type": "string"}
-            
-        elif isinstance(value, list):
-            if not value:
-                return {"type": "array", "items": {}}
-            else:
-                return {"type": "array", "items": self._infer_type_schema(value[0])}
-                
-        elif isinstance(value, dict):
-            properties = {}
-            for k, v in value.items():
-                properties[k] = self._infer_type_schema(v)
-                
-            return {"type": "object", "properties": properties}
-            
-        # Default fallback
-        return {"type": "string"}
+        return _infer_type_schema(value)